@@ -1,4 +1,19 @@
-from .llm_recorder import LLMRecorder, LLMInteraction, Persistence
+from .llm_recorder import (
+    LLMRecorder,
+    AsyncLLMRecorder,
+    LLMInteraction,
+    Persistence,
+    JsonlPersistence,
+    SqlitePersistence,
+)
 from .providers.litellm_recorder import enable_replay_mode
 
-__all__ = ["LLMRecorder", "LLMInteraction", "Persistence", "enable_replay_mode"]
+__all__ = [
+    "LLMRecorder",
+    "AsyncLLMRecorder",
+    "LLMInteraction",
+    "Persistence",
+    "JsonlPersistence",
+    "SqlitePersistence",
+    "enable_replay_mode",
+]
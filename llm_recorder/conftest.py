@@ -0,0 +1,27 @@
+import pytest
+
+
+# Shared by every test in the session; tests must not mutate them
+@pytest.fixture(scope="session")
+def sample_request():
+    return {
+        "model": "gpt-3.5-turbo",
+        "messages": [{"role": "user", "content": "Hello"}],
+    }
+
+
+@pytest.fixture(scope="session")
+def sample_response():
+    return {
+        "id": "chatcmpl-123",
+        "object": "chat.completion",
+        "created": 1677652288,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": "Hello there!"},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 9, "completion_tokens": 12, "total_tokens": 21},
+    }
@@ -1,14 +1,63 @@
+import copy
+import gzip
+import hashlib
 import logging
-from typing import Any, List, Optional, Union, Dict, Protocol
+import os
+import re
+import sqlite3
+import threading
+import weakref
+from typing import Any, Callable, List, Optional, Sequence, Set, Tuple, Union, Dict, Protocol
 from datetime import datetime
 from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import json
 from abc import ABC, abstractmethod
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 logger = logging.getLogger(__name__)
 
+# Names of FilePersistence files: "1.request.json" or, in the per-key layout, "1.request_model.json"
+_FILE_NAME_RE = re.compile(r"^(\d+)\.(request|response)(?:_(.+))?\.json$")
+# Temporary files FilePersistence writes before renaming them into place
+_TMP_NAME_RE = re.compile(r"^\..+\.json\.tmp$")
+
+
+def json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, sort_keys=sort_keys).encode()
+
+
+def json_loads(data: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _read_json(path: Union[str, Path]) -> Any:
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
+
+def _request_key(request: Dict[str, Any]) -> str:
+    """Return a SHA-256 digest of the canonical JSON form of a request."""
+    return hashlib.sha256(json_dumps(request, sort_keys=True)).hexdigest()
+
 
 @dataclass
 class LLMInteraction:
@@ -18,92 +67,375 @@ class LLMInteraction:
 
 
 class Persistence(Protocol):
-    def load_all(self, limit: int) -> List[LLMInteraction]: ...
-    def save(self, interaction: LLMInteraction) -> None: ...
+    """
+    Storage for recorded interactions.
+
+    - load_all(limit): Return the first limit interactions, ordered by index,
+      discard the rest and renumber the kept ones 1..N, so that saves from
+      N + 1 on never overwrite them even if failed calls left gaps
+    - save(interaction, index): Store an interaction at a 1-based index; saves
+      may arrive out of order and from several threads
+    """
+
+    def load_all(self, limit: int) -> Sequence[LLMInteraction]: ...
+    def save(self, interaction: LLMInteraction, index: int) -> None: ...
+
+
+class _LazyInteractions(Sequence):
+    """
+    A read-only sequence of interactions that are only read from
+    the persistence layer when they are accessed.
+    """
+
+    def __init__(self, load: Callable[[int], LLMInteraction], indices: List[int]):
+        self._load = load
+        self._indices = indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._load(i) for i in self._indices[position]]
+        return self._load(self._indices[position])
 
 
 class FilePersistence:
     """
     A file-based persistence layer that saves each LLMInteraction
-    in separate JSON files:
-      - 1.request_xxx.json
-      - 1.response_xxx.json
+    in two JSON files:
+      - 1.request.json
+      - 1.response.json
       - etc.
+
+    Recordings made by earlier versions, with one file per key
+    (1.request_xxx.json, 1.response_xxx.json), can still be replayed.
+
+    Only the request and the response are stored: interactions loaded back
+    have an empty timestamp. Use JsonlPersistence or SqlitePersistence to keep it.
+
+    Files are written to a temporary name and renamed into place, so an
+    interrupted save never leaves a truncated JSON file behind.
     """
 
-    def __init__(self, directory: Path):
+    def __init__(self, directory: Path, durable: bool = False, pretty: bool = True):
+        """
+        Args:
+            directory: The directory to store the interaction files in
+            durable: fsync every file before renaming it into place, defaults to False
+            pretty: Indent the JSON so it is easy to read and edit; compact JSON is
+                faster to write and smaller, defaults to True
+        """
         self.directory = directory
+        self.durable = durable
+        self.pretty = pretty
         self.directory.mkdir(parents=True, exist_ok=True)
-        self.loaded_files = set()
+
+    def load_all(self, limit: int) -> Sequence[LLMInteraction]:
+        files, other_files = self._list_files()
+        kept_indices = sorted(i for i, parts in files.items() if "request" in parts)[:limit]
+
+        # Clean up the directory; the kept interactions are read lazily on replay
+        self._cleanup_directory(files, other_files, set(kept_indices))
+        kept_files = self._renumber(files, kept_indices)
+        return _LazyInteractions(
+            lambda index: self._load_single_interaction(kept_files[index]), list(kept_files)
+        )
+
+    def load(self, index: int) -> LLMInteraction:
+        """
+        Load the interaction saved at index by reading its files directly,
+        without listing or cleaning up the directory. Its timestamp is empty,
+        as the files don't store it.
+        """
+        try:
+            request = _read_json(self.directory / f"{index}.request.json")
+        except FileNotFoundError:
+            # Per-key recordings have no fixed file names
+            files, _ = self._list_files()
+            if index not in files:
+                raise
+            return self._load_single_interaction(files[index])
+        # A request without its response is a broken recording, not another layout
+        return LLMInteraction(
+            timestamp="",
+            request=request,
+            response=_read_json(self.directory / f"{index}.response.json"),
+        )
+
+    def _list_files(
+        self,
+    ) -> Tuple[Dict[int, Dict[str, Dict[Optional[str], str]]], List[str]]:
+        """
+        List the directory once. Returns a map of index -> "request"/"response" -> key -> path
+        (the key is None for the combined file and the top-level key in the per-key layout)
+        and the paths of any other JSON files or leftover temporary files.
+        """
+        files: Dict[int, Dict[str, Dict[Optional[str], str]]] = {}
+        other_files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                match = _FILE_NAME_RE.match(entry.name)
+                if match:
+                    index, kind, key = int(match[1]), match[2], match[3]
+                    files.setdefault(index, {}).setdefault(kind, {})[key] = entry.path
+                elif entry.name.endswith(".json") or _TMP_NAME_RE.match(entry.name):
+                    other_files.append(entry.path)
+        return files, other_files
+
+    def _cleanup_directory(
+        self,
+        files: Dict[int, Dict[str, Dict[Optional[str], str]]],
+        other_files: List[str],
+        kept_indices: Set[int],
+    ) -> None:
+        """Remove files that don't belong to the kept interactions."""
+        for index, parts in files.items():
+            if index not in kept_indices:
+                for paths in parts.values():
+                    for path in paths.values():
+                        os.unlink(path)
+        for path in other_files:
+            os.unlink(path)
+
+    def _renumber(
+        self, files: Dict[int, Dict[str, Dict[Optional[str], str]]], kept_indices: List[int]
+    ) -> Dict[int, Dict[str, Dict[Optional[str], str]]]:
+        """
+        Rename the files of the kept interactions to indices 1..N, closing any gaps,
+        and return them by their new index.
+        """
+        kept_files = {}
+        for new_index, index in enumerate(kept_indices, start=1):
+            parts = files[index]
+            if new_index != index:
+                # Indices below new_index are taken by earlier kept interactions, and the
+                # others were removed by the cleanup, so the new names are always free
+                parts = {
+                    kind: {key: self._rename_index(path, new_index) for key, path in paths.items()}
+                    for kind, paths in parts.items()
+                }
+            kept_files[new_index] = parts
+        return kept_files
+
+    def _rename_index(self, path: str, new_index: int) -> str:
+        name = os.path.basename(path)
+        new_path = os.path.join(self.directory, f"{new_index}.{name.split('.', 1)[1]}")
+        os.rename(path, new_path)
+        return new_path
+
+    def save(self, interaction: LLMInteraction, index: int) -> None:
+        self._write(f"{index}.request.json", json_dumps(interaction.request, indent=self.pretty))
+        self._write(f"{index}.response.json", json_dumps(interaction.response, indent=self.pretty))
+
+    def _write(self, name: str, data: bytes) -> None:
+        """Write a file atomically: write a temporary file, then rename it to name."""
+        tmp_path = self.directory / f".{name}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if self.durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.directory / name)
+
+    def _load_part(self, paths: Dict[Optional[str], str]) -> Dict[str, Any]:
+        """Load a request or response dictionary from its file(s)."""
+        if None in paths:
+            return _read_json(paths[None])
+        # Per-key layout: one file per top-level key
+        return {key: _read_json(path) for key, path in paths.items()}
+
+    def _load_single_interaction(
+        self, parts: Dict[str, Dict[Optional[str], str]]
+    ) -> LLMInteraction:
+        return LLMInteraction(
+            timestamp="",
+            request=self._load_part(parts.get("request", {})),
+            response=self._load_part(parts.get("response", {})),
+        )
+
+
+class JsonlPersistence:
+    """
+    A persistence layer that appends each LLMInteraction as a single line
+    of one JSONL file:
+      {"index": 1, "timestamp": ..., "request": {...}, "response": {...}}
+
+    Recording an interaction is a single append instead of one file per key.
+    A path ending in ".gz" (e.g. "interactions.jsonl.gz") is gzip-compressed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._open_for_append()
+
+    def _open_for_append(self) -> None:
+        # Every record goes out in one write on an O_APPEND descriptor, so
+        # concurrent saves never interleave within a line
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._close_fd = weakref.finalize(self, os.close, self._fd)
+
+    def _open(self, mode: str):
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode)
+        return self.path.open(mode)
+
+    def _encode(self, record: Dict[str, Any]) -> bytes:
+        line = json_dumps(record) + b"\n"
+        if self.path.suffix == ".gz":
+            # Each record is a complete gzip member, so the file stays readable after every append
+            return gzip.compress(line)
+        return line
+
+    def _read_lines(self) -> Tuple[List[bytes], bool]:
+        """
+        Read the complete lines of the file. Returns them and whether the file
+        ends with a partial record left by an interrupted append, which is skipped.
+        """
+        lines = []
+        partial = False
+        try:
+            with self._open("rb") as f:
+                for line in f:
+                    lines.append(line)
+        except (EOFError, gzip.BadGzipFile):
+            # The last gzip member was cut short
+            partial = True
+        if lines and not lines[-1].endswith(b"\n"):
+            lines.pop()
+            partial = True
+        if partial:
+            logger.warning(f"Skipping a partially written record at the end of {self.path}")
+        return lines, partial
 
     def load_all(self, limit: int) -> List[LLMInteraction]:
-        interactions = []
-        # We rely on files named "1.request_*.json", "2.request_*.json", etc.
-        request_files = sorted(self.directory.glob("*.request_*.json"))
-
-        # Get unique indices from request files
-        unique_indices = {int(f.name.split(".")[0]) for f in request_files}
-        sorted_indices = sorted(unique_indices)
-
-        for i in sorted_indices[:limit]:
-            try:
-                interaction = self._load_single_interaction(i)
-                interactions.append(interaction)
-            except FileNotFoundError as e:
-                logger.warning(f"Incomplete interaction at index={i}: {e}")
-
-        # Clean up the directory after loading
-        self._cleanup_directory()
-        return interactions
-
-    def _cleanup_directory(self) -> None:
-        """Remove files that weren't loaded."""
-        for file in self.directory.glob("*.json"):
-            if file not in self.loaded_files:
-                file.unlink()
+        lines, partial = self._read_lines()
+        records = {}
+        for line in lines:
+            if line.strip():
+                record = json_loads(line)
+                records[record["index"]] = record
+
+        kept = [records[i] for i in sorted(records)[:limit]]
+        # Number the kept records 1..N, like FilePersistence does
+        renumbered = False
+        for new_index, record in enumerate(kept, start=1):
+            if record["index"] != new_index:
+                record["index"] = new_index
+                renumbered = True
+
+        # Drop the records that weren't loaded, like FilePersistence does
+        if partial or renumbered or len(kept) < len(lines):
+            self._rewrite(kept)
+
+        return [
+            LLMInteraction(
+                timestamp=record.get("timestamp", ""),
+                request=record["request"],
+                response=record["response"],
+            )
+            for record in kept
+        ]
+
+    def _rewrite(self, records: List[Dict[str, Any]]) -> None:
+        """Replace the file with records atomically: write a temporary file, then rename it."""
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            for record in records:
+                f.write(self._encode(record))
+        os.replace(tmp_path, self.path)
+        # The append descriptor still points at the replaced file
+        self._close_fd()
+        self._open_for_append()
 
     def save(self, interaction: LLMInteraction, index: int) -> None:
-        # Save each key in the request dictionary as a separate file
-        for key, value in interaction.request.items():
-            filename = f"{index}.request_{key}.json"
-            with open(self.directory / filename, "w") as f:
-                json.dump(value, f, indent=2)
-
-        # Save each key in the response dictionary as a separate file
-        for key, value in interaction.response.items():
-            filename = f"{index}.response_{key}.json"
-            with open(self.directory / filename, "w") as f:
-                json.dump(value, f, indent=2)
+        record = {
+            "index": index,
+            "timestamp": interaction.timestamp,
+            "request": interaction.request,
+            "response": interaction.response,
+        }
+        data = memoryview(self._encode(record))
+        while data:
+            data = data[os.write(self._fd, data):]
+
+
+class SqlitePersistence:
+    """
+    A persistence layer that stores each LLMInteraction as a row of an SQLite table:
+      interactions(idx, timestamp, request, response)
 
-    def _load_single_interaction(self, index: int) -> LLMInteraction:
-        # Find all request and response files for this index
-        request_files = self.directory.glob(f"{index}.request_*.json")
-        response_files = self.directory.glob(f"{index}.response_*.json")
-
-        # Build request dictionary
-        request_data = {}
-        for file in request_files:
-            # First get the part after 'request_'
-            after_prefix = str(file).split("request_")[1]
-            # Then remove the '.json' suffix
-            key = after_prefix.rsplit(".json", 1)[0]
-            with file.open("r") as f:
-                request_data[key] = json.load(f)
-            self.loaded_files.add(file)  # Track this file as loaded
-
-        # Build response dictionary
-        response_data = {}
-        for file in response_files:
-            # First get the part after 'response_'
-            after_prefix = str(file).split("response_")[1]
-            # Then remove the '.json' suffix
-            key = after_prefix.rsplit(".json", 1)[0]
-            with file.open("r") as f:
-                response_data[key] = json.load(f)
-            self.loaded_files.add(file)  # Track this file as loaded
+    Replayed interactions are read by index, one row at a time.
+    """
 
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Saves may come from the worker threads of response_batch_completion
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._close = weakref.finalize(self, self._connection.close)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS interactions ("
+                "idx INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, "
+                "request BLOB NOT NULL, response BLOB NOT NULL)"
+            )
+
+    def load_all(self, limit: int) -> Sequence[LLMInteraction]:
+        with self._lock, self._connection:
+            kept_indices = [
+                row[0]
+                for row in self._connection.execute(
+                    "SELECT idx FROM interactions ORDER BY idx LIMIT ?", (limit,)
+                )
+            ]
+            # Drop the rows that weren't loaded, like FilePersistence does
+            self._connection.execute(
+                "DELETE FROM interactions WHERE idx NOT IN "
+                "(SELECT idx FROM interactions ORDER BY idx LIMIT ?)",
+                (limit,),
+            )
+            # Number the kept rows 1..N, like FilePersistence does; ascending
+            # order means each new idx is already free
+            for new_index, index in enumerate(kept_indices, start=1):
+                if new_index != index:
+                    self._connection.execute(
+                        "UPDATE interactions SET idx = ? WHERE idx = ?", (new_index, index)
+                    )
+        return _LazyInteractions(
+            self._load_single_interaction, list(range(1, len(kept_indices) + 1))
+        )
+
+    def save(self, interaction: LLMInteraction, index: int) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO interactions VALUES (?, ?, ?, ?)",
+                (
+                    index,
+                    interaction.timestamp,
+                    json_dumps(interaction.request),
+                    json_dumps(interaction.response),
+                ),
+            )
+
+    def close(self) -> None:
+        """Close the database connection; it is also closed when the instance is garbage collected."""
+        self._close()
+
+    def _load_single_interaction(self, index: int) -> LLMInteraction:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT timestamp, request, response FROM interactions WHERE idx = ?",
+                (index,),
+            ).fetchone()
+        if row is None:
+            # Another instance's load_all may have dropped it
+            raise LookupError(f"Interaction #{index} is no longer in {self.path}")
+        timestamp, request, response = row
         return LLMInteraction(
-            timestamp="", request=request_data, response=response_data
+            timestamp=timestamp, request=json_loads(request), response=json_loads(response)
         )
 
 
@@ -113,12 +445,21 @@ class LLMRecorder(ABC):
     - live_call(**kwargs): Make actual calls to the LLM API
     - req_to_dict(req): Convert request parameters to a serializable dictionary
     - res_to_dict(res): Convert API response to a serializable dictionary
+
+    and can override alive_call(**kwargs) to support adict_completion and
+    aresponse_completion, dict_to_res(res_dict) to rebuild a response object
+    from a recorded dictionary for response_completion, and is_cacheable(res_dict)
+    to keep unusable responses out of the cache_by_request cache.
     """
 
+    # Maximum number of responses kept in memory when cache_by_request is enabled
+    response_cache_size: int = 256
+
     def __init__(
         self,
         persistence: Union[str, Path, "Persistence"],
         replay_count: int = 0,
+        cache_by_request: bool = False,
     ):
         """
         Initialize an LLMRecorder.
@@ -126,6 +467,8 @@ class LLMRecorder(ABC):
         Args:
             persistence: Either a Persistence implementation or a path (str/Path) for default FilePersistence
             replay_count: The number of interactions to replay before making live calls, defaults to 0
+            cache_by_request: When True, a request identical to one already replayed or recorded
+                reuses that response instead of making a live call, defaults to False
         """
         # If persistence is a string/Path, create a FilePersistence
         if isinstance(persistence, (str, Path)):
@@ -135,9 +478,14 @@ class LLMRecorder(ABC):
 
         self.replay_count = replay_count
         self.replay_index = 0
+        self.cache_by_request = cache_by_request
+        # Least recently used responses, keyed by _request_key of their request
+        self._response_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Guards replay_index and the response cache when calls come from several threads
+        self._lock = threading.Lock()
 
         # Load existing interactions (up to replay_count) from the persistence layer
-        self.interactions: List[LLMInteraction] = self.persistence.load_all(
+        self.interactions: Sequence[LLMInteraction] = self.persistence.load_all(
             limit=self.replay_count
         )
         if replay_count > len(self.interactions):
@@ -152,6 +500,13 @@ class LLMRecorder(ABC):
         """
         pass
 
+    async def alive_call(self, **kwargs) -> Any:
+        """
+        Make a live call to the LLM from async code.
+        Recorders that support adict_completion and aresponse_completion override this.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support async calls")
+
     @abstractmethod
     def req_to_dict(self, req: Any) -> Dict[str, Any]:
         """
@@ -166,39 +521,199 @@ class LLMRecorder(ABC):
         """
         pass
 
-    def _replay_interaction(self) -> LLMInteraction:
+    def dict_to_res(self, res_dict: Dict[str, Any]) -> Any:
+        """
+        Convert a recorded response dictionary back to a response.
+        Returns the dictionary unchanged by default.
+        """
+        return res_dict
+
+    def is_cacheable(self, res_dict: Dict[str, Any]) -> bool:
+        """
+        Whether a response may be reused for identical requests when cache_by_request is enabled.
+        Every response is cacheable by default.
+        """
+        return True
+
+    def _replay_interaction(self, index: int) -> LLMInteraction:
         """Replay a saved interaction."""
-        interaction = self.interactions[self.replay_index]
-        logger.info(f"Replaying interaction #{self.replay_index}")
+        interaction = self.interactions[index]
+        logger.info(f"Replaying interaction #{index}")
+        if self.cache_by_request:
+            self._cache_response(_request_key(interaction.request), interaction.response)
         return interaction
 
-    def _make_live_call(self, **kwargs) -> LLMInteraction:
-        """Make a live call and create a new interaction."""
-        logger.info("Making live call (no more replays available)")
-        response = self.live_call(**kwargs)
+    def _cached_response(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            response = self._response_cache.get(key)
+            if response is not None:
+                self._response_cache.move_to_end(key)
+        # Every hit gets its own copy, so callers can't change each other's responses
+        return copy.deepcopy(response)
+
+    def _cache_response(self, key: str, response: Dict[str, Any]) -> None:
+        if not self.is_cacheable(response):
+            return
+        # Copied so later changes to the caller's response don't reach the cache
+        response = copy.deepcopy(response)
+        with self._lock:
+            self._response_cache[key] = response
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > self.response_cache_size:
+                self._response_cache.popitem(last=False)
+
+    def _lookup_request(
+        self, kwargs: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Convert a request to a dictionary and look up a cached response for it.
+        Returns the request dictionary, its cache key (None unless cache_by_request) and the cached response.
+        """
+        request = self.req_to_dict(kwargs)
+        key = _request_key(request) if self.cache_by_request else None
+        response = self._cached_response(key) if key is not None else None
+        if response is not None:
+            logger.info("Reusing the response of an identical earlier request")
+        else:
+            logger.info("Making live call (no more replays available)")
+        return request, key, response
+
+    def _record(
+        self, index: int, request: Dict[str, Any], key: Optional[str], response: Dict[str, Any]
+    ) -> LLMInteraction:
+        """Cache and save a new interaction."""
+        if key is not None:
+            self._cache_response(key, response)
         interaction = LLMInteraction(
             timestamp=datetime.now().isoformat(),
-            request=self.req_to_dict(kwargs),
-            response=self.res_to_dict(response),
+            request=request,
+            response=response,
         )
         # Save the new interaction immediately
-        self.persistence.save(interaction, self.replay_index + 1)
+        self.persistence.save(interaction, index + 1)
         return interaction
 
+    def _make_live_call(self, index: int, **kwargs) -> Tuple[LLMInteraction, Any]:
+        """
+        Make a live call (or reuse a cached response) and create a new interaction.
+        Returns the interaction and the live response, which is None for a cached response.
+        """
+        request, key, response = self._lookup_request(kwargs)
+        live_response = None
+        if response is None:
+            live_response = self.live_call(**kwargs)
+            response = self.res_to_dict(live_response)
+        return self._record(index, request, key, response), live_response
+
+    async def _amake_live_call(self, index: int, **kwargs) -> Tuple[LLMInteraction, Any]:
+        """Like _make_live_call, but awaits alive_call."""
+        request, key, response = self._lookup_request(kwargs)
+        live_response = None
+        if response is None:
+            live_response = await self.alive_call(**kwargs)
+            response = self.res_to_dict(live_response)
+        return self._record(index, request, key, response), live_response
+
+    def _complete_at(self, index: int, **kwargs) -> Tuple[LLMInteraction, Any]:
+        """
+        Either replay the saved interaction at index or make a new call (which is recorded).
+        Returns the interaction and the live response, if a live call was made.
+        """
+        # If we have replay interactions left, replay them
+        if index < len(self.interactions):
+            return self._replay_interaction(index), None
+        # Otherwise, make a live call and create a new interaction
+        return self._make_live_call(index, **kwargs)
+
+    async def _acomplete_at(self, index: int, **kwargs) -> Tuple[LLMInteraction, Any]:
+        """Like _complete_at, but makes live calls with alive_call."""
+        if index < len(self.interactions):
+            return self._replay_interaction(index), None
+        return await self._amake_live_call(index, **kwargs)
+
+    def _reserve_indices(self, count: int) -> int:
+        """Reserve the next count interaction indices and return the first one."""
+        with self._lock:
+            start = self.replay_index
+            self.replay_index += count
+        return start
+
+    def _complete(self, **kwargs) -> Tuple[LLMInteraction, Any]:
+        return self._complete_at(self._reserve_indices(1), **kwargs)
+
+    def _to_response(self, interaction: LLMInteraction, live_response: Any) -> Any:
+        if live_response is not None:
+            return live_response
+        return self.dict_to_res(interaction.response)
+
     def dict_completion(self, **kwargs) -> Dict[str, Any]:
         """
         Either replay a saved interaction or make a new call (which is recorded).
         """
-        # If we have replay interactions left, replay them
-        if self.replay_index < len(self.interactions):
-            interaction = self._replay_interaction()
-        else:
-            # Otherwise, make a live call and create a new interaction
-            interaction = self._make_live_call(**kwargs)
+        interaction, _ = self._complete(**kwargs)
+        return interaction.response
+
+    def response_completion(self, **kwargs) -> Any:
+        """
+        Like dict_completion, but returns a response object: the live response itself,
+        or one rebuilt from the recorded dictionary with dict_to_res.
+        """
+        return self._to_response(*self._complete(**kwargs))
 
-        self.replay_index += 1
+    async def adict_completion(self, **kwargs) -> Dict[str, Any]:
+        """
+        Async version of dict_completion, for recorders that implement alive_call.
+        """
+        interaction, _ = await self._acomplete_at(self._reserve_indices(1), **kwargs)
         return interaction.response
 
+    async def aresponse_completion(self, **kwargs) -> Any:
+        """
+        Async version of response_completion, for recorders that implement alive_call.
+        """
+        return self._to_response(*await self._acomplete_at(self._reserve_indices(1), **kwargs))
+
+    def response_batch_completion(
+        self, many_kwargs: List[Dict[str, Any]], max_workers: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Like response_completion for several requests, whose live calls run concurrently.
+
+        Each request is recorded at its position in many_kwargs, so replaying the
+        batch returns the responses in the same order.
+
+        Args:
+            many_kwargs: The keyword arguments of each request
+            max_workers: Maximum number of concurrent live calls, defaults to ThreadPoolExecutor's default
+        """
+        start = self._reserve_indices(len(many_kwargs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit everything first, then collect, so the calls overlap
+            futures = [
+                executor.submit(self._complete_at, start + offset, **kwargs)
+                for offset, kwargs in enumerate(many_kwargs)
+            ]
+            results = [future.result() for future in futures]
+        return [self._to_response(*result) for result in results]
+
+
+class AsyncLLMRecorder(LLMRecorder):
+    """
+    An LLMRecorder for async-only clients. A concrete subclass implements
+    alive_call instead of live_call, together with req_to_dict and res_to_dict,
+    and makes calls through adict_completion or aresponse_completion.
+    """
+
+    def live_call(self, **kwargs) -> Any:
+        raise NotImplementedError(f"{type(self).__name__} only supports async calls")
+
+    @abstractmethod
+    async def alive_call(self, **kwargs) -> Any:
+        """
+        Make a live call to the LLM.
+        """
+        pass
+
 
 if __name__ == "__main__":
 
@@ -1,10 +1,11 @@
 from typing import Dict, Any, Union
 from pathlib import Path
-from ..llm_recorder import LLMRecorder, Persistence
+from ..llm_recorder import LLMRecorder, AsyncLLMRecorder, Persistence
+from .pydantic_conversions import PydanticConversions
 
 try:
-    from anthropic import Anthropic
-    from anthropic.resources.messages import Messages
+    from anthropic import Anthropic, AsyncAnthropic
+    from anthropic.resources.messages import Messages, AsyncMessages
     from anthropic.types import Message
 except ImportError:
     raise ImportError(
@@ -13,7 +14,21 @@ except ImportError:
     )
 
 
-class ReplayMessages(Messages, LLMRecorder):
+# Stop reasons of messages that can be reused for identical requests
+_CACHEABLE_STOP_REASONS = {"end_turn", "max_tokens", "stop_sequence", "tool_use"}
+
+
+class _MessageConversions(PydanticConversions):
+    """Message conversions, and which messages the request cache may reuse"""
+
+    response_model = Message
+
+    def is_cacheable(self, res_dict: Dict[str, Any]) -> bool:
+        """Only reuse messages that stopped normally"""
+        return res_dict.get("stop_reason") in _CACHEABLE_STOP_REASONS
+
+
+class ReplayMessages(Messages, _MessageConversions, LLMRecorder):
     """Wrapper for Anthropic messages that uses LLMRecorder to replay messages"""
 
     def __init__(
@@ -21,12 +36,14 @@ class ReplayMessages(Messages, LLMRecorder):
         client: Anthropic,
         persistence: Union[str, Path, Persistence],
         replay_count: int = 0,
+        cache_by_request: bool = False,
     ):
         super().__init__(client=client)
         LLMRecorder.__init__(
             self,
             persistence,
             replay_count=replay_count,
+            cache_by_request=cache_by_request,
         )
 
     def live_call(self, **kwargs) -> Message:
@@ -34,16 +51,37 @@ class ReplayMessages(Messages, LLMRecorder):
         response = super().create(**kwargs)
         return response
 
-    def req_to_dict(self, req: Dict[str, Any]) -> Dict[str, Any]:
-        return req
+    def create(self, **kwargs) -> Message:
+        """Create a message with replay support"""
+        return self.response_completion(**kwargs)
 
-    def res_to_dict(self, res: Message) -> Dict[str, Any]:
-        return res.model_dump()
 
-    def create(self, **kwargs) -> Message:
+class AsyncReplayMessages(AsyncMessages, _MessageConversions, AsyncLLMRecorder):
+    """Wrapper for Anthropic async messages that uses LLMRecorder to replay messages"""
+
+    def __init__(
+        self,
+        client: AsyncAnthropic,
+        persistence: Union[str, Path, Persistence],
+        replay_count: int = 0,
+        cache_by_request: bool = False,
+    ):
+        super().__init__(client=client)
+        LLMRecorder.__init__(
+            self,
+            persistence,
+            replay_count=replay_count,
+            cache_by_request=cache_by_request,
+        )
+
+    async def alive_call(self, **kwargs) -> Message:
+        """Make a live API call to Anthropic"""
+        response = await super().create(**kwargs)
+        return response
+
+    async def create(self, **kwargs) -> Message:
         """Create a message with replay support"""
-        dict_response = self.dict_completion(**kwargs)
-        return Message.model_validate(dict_response)
+        return await self.aresponse_completion(**kwargs)
 
 
 class ReplayAnthropic(Anthropic):
@@ -53,6 +91,7 @@ class ReplayAnthropic(Anthropic):
         self,
         persistence: Union[str, Path, Persistence],
         replay_count: int = 0,
+        cache_by_request: bool = False,
         **kwargs,
     ):
         """
@@ -61,6 +100,7 @@ class ReplayAnthropic(Anthropic):
         Args:
             persistence: Either a Persistence implementation or a path (str/Path) for default FilePersistence
             replay_count: Number of interactions to replay before making live calls
+            cache_by_request: Reuse the response of an identical earlier request instead of making a live call
             **kwargs: Additional arguments passed to Anthropic client
         """
         super().__init__(**kwargs)
@@ -70,4 +110,35 @@ class ReplayAnthropic(Anthropic):
             client=self,
             persistence=persistence,
             replay_count=replay_count,
+            cache_by_request=cache_by_request,
+        )
+
+
+class AsyncReplayAnthropic(AsyncAnthropic):
+    """Async Anthropic client that supports replaying messages"""
+
+    def __init__(
+        self,
+        persistence: Union[str, Path, Persistence],
+        replay_count: int = 0,
+        cache_by_request: bool = False,
+        **kwargs,
+    ):
+        """
+        Initialize AsyncReplayAnthropic.
+
+        Args:
+            persistence: Either a Persistence implementation or a path (str/Path) for default FilePersistence
+            replay_count: Number of interactions to replay before making live calls
+            cache_by_request: Reuse the response of an identical earlier request instead of making a live call
+            **kwargs: Additional arguments passed to AsyncAnthropic client
+        """
+        super().__init__(**kwargs)
+
+        # Create messages instance with replay support
+        self.messages = AsyncReplayMessages(
+            client=self,
+            persistence=persistence,
+            replay_count=replay_count,
+            cache_by_request=cache_by_request,
         )
@@ -0,0 +1,14 @@
+from typing import Any, Dict
+
+# Finish reasons of OpenAI-style chat completions that can be reused for identical requests
+CACHEABLE_FINISH_REASONS = frozenset(
+    {"stop", "length", "content_filter", "tool_calls", "function_call"}
+)
+
+
+def choices_finished_normally(res_dict: Dict[str, Any]) -> bool:
+    """Whether a recorded OpenAI-style chat completion has choices that all finished normally"""
+    choices = res_dict.get("choices") or []
+    return bool(choices) and all(
+        choice.get("finish_reason") in CACHEABLE_FINISH_REASONS for choice in choices
+    )
@@ -0,0 +1,19 @@
+import httpx
+import pytest
+
+
+@pytest.fixture
+def mock_transport():
+    """Factory for transports that answer every request with response and collect the requests
+
+    Pass httpx_module for SDKs built on a different httpx package, like anthropic on httpx2.
+    """
+
+    def make(requests, response, httpx_module=httpx):
+        def handler(request):
+            requests.append(request)
+            return httpx_module.Response(200, json=response)
+
+        return httpx_module.MockTransport(handler)
+
+    return make
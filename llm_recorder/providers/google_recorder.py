@@ -21,6 +21,7 @@ class RecorderGenerativeModel(GenerativeModel, LLMRecorder):
         model_name: str,
         persistence: Union[str, Path, Persistence],
         replay_count: int = 0,
+        cache_by_request: bool = False,
         **kwargs,
     ):
         """
@@ -30,6 +31,7 @@ class RecorderGenerativeModel(GenerativeModel, LLMRecorder):
             model_name: Name of the Google model to use (e.g., "gemini-pro")
             persistence: Directory to load interactions from or a Persistence implementation
             replay_count: Number of interactions to replay before making live calls
+            cache_by_request: Reuse the response of an identical earlier request instead of making a live call
             **kwargs: Additional arguments passed to GenerativeModel constructor
         """
         super().__init__(model_name=model_name, **kwargs)
@@ -37,6 +39,7 @@ class RecorderGenerativeModel(GenerativeModel, LLMRecorder):
             self,
             persistence=persistence,
             replay_count=replay_count,
+            cache_by_request=cache_by_request,
         )
 
     def live_call(self, **kwargs) -> GenerateContentResponse:
@@ -44,6 +47,11 @@ class RecorderGenerativeModel(GenerativeModel, LLMRecorder):
         response = super().generate_content(**kwargs)
         return response
 
+    async def alive_call(self, **kwargs) -> GenerateContentResponse:
+        """Make a live async API call to Google"""
+        response = await super().generate_content_async(**kwargs)
+        return response
+
     def req_to_dict(self, req: Dict[str, Any]) -> Dict[str, Any]:
         """Convert a request to a dictionary"""
         return req
@@ -52,11 +60,17 @@ class RecorderGenerativeModel(GenerativeModel, LLMRecorder):
         """Convert a response to a dictionary"""
         return res.to_dict()
 
+    def dict_to_res(self, res_dict: Dict[str, Any]) -> GenerateContentResponse:
+        """Convert a dictionary back to a model response object"""
+        response = protos.GenerateContentResponse(**res_dict)
+        return GenerateContentResponse.from_response(response)
+
     def generate_content(self, contents: str, **kwargs) -> GenerateContentResponse:
         """Generate content with recording/replay support"""
         kwargs["contents"] = contents
+        return self.response_completion(**kwargs)
 
-        dict_response = self.dict_completion(**kwargs)
-        """Convert a dictionary back to a model response object"""
-        response = protos.GenerateContentResponse(**dict_response)
-        return GenerateContentResponse.from_response(response)
+    async def generate_content_async(self, contents: str, **kwargs) -> GenerateContentResponse:
+        """Generate content asynchronously with recording/replay support"""
+        kwargs["contents"] = contents
+        return await self.aresponse_completion(**kwargs)
@@ -1,64 +1,134 @@
 from typing import Any, Dict, Union
 import httpx
 from pathlib import Path
-from llm_recorder import LLMRecorder
+from ..llm_recorder import LLMRecorder, AsyncLLMRecorder, Persistence, json_dumps, json_loads
 from openai import OpenAI
-import json
 
 
-class HTTPRecorder(httpx.Client, LLMRecorder):
-    """
-    An HTTP client that records and replays LLM API interactions.
-    Inherits from both httpx.Client and LLMRecorder.
-    """
+# Connection pool defaults for live calls, so concurrent requests reuse keep-alive connections
+_DEFAULT_LIMITS = httpx.Limits(
+    max_connections=256, max_keepalive_connections=64, keepalive_expiry=60.0
+)
 
-    def __init__(self, store_path: Union[str, Path], replay_count: int = 0, **kwargs):
-        # Initialize both parent classes
-        httpx.Client.__init__(self, **kwargs)
-        LLMRecorder.__init__(self, store_path=store_path, replay_count=replay_count)
+# Response headers that describe the encoded body rather than the recorded JSON
+_BODY_FORMAT_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
 
-    def live_call(self, **kwargs) -> httpx.Response:
-        """Make a live HTTP request using the parent httpx.Client"""
 
-        # Make the actual HTTP request
-        return super().send(**kwargs)
+class _HTTPConversions:
+    """Converts httpx requests and responses to JSON, keeping status and headers for replay"""
 
     def res_to_dict(self, res: httpx.Response) -> Dict[str, Any]:
         """Convert an httpx.Response object to a dictionary"""
         return {
             "status_code": res.status_code,
-            "headers": dict(res.headers),
-            "json": res.json(),
+            # Name/value pairs keep repeated headers such as set-cookie apart
+            "headers": res.headers.multi_items(),
+            "json": json_loads(res.content),
         }
 
     def req_to_dict(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
-        request = kwargs.pop("request", None)
         """Convert an httpx.Request object to a dictionary"""
-        content = request.content.decode("utf-8")
-        decoded_content = json.loads(content)
+        request = kwargs["request"]
+        decoded_content = json_loads(request.content)
 
         return {
             "method": request.method,
             "url": str(request.url),
             "headers": dict(request.headers),
             "json": decoded_content,
-            "kwargs": kwargs,
+            # Client defaults are placeholders that mean "not passed" and aren't serializable
+            "kwargs": {
+                k: v
+                for k, v in kwargs.items()
+                if k != "request" and v is not httpx.USE_CLIENT_DEFAULT
+            },
         }
 
+    def dict_to_res(self, res_dict: Dict[str, Any]) -> httpx.Response:
+        """Convert a recorded dictionary back to an httpx.Response"""
+        headers = res_dict["headers"]
+        # Recordings made before headers were stored as pairs hold a dict
+        items = headers.items() if isinstance(headers, dict) else headers
+        # The recorded body is stored decoded; httpx sets the length of the new content itself
+        headers = [
+            (name, value)
+            for name, value in items
+            if name.lower() not in _BODY_FORMAT_HEADERS
+        ]
+        return httpx.Response(
+            status_code=res_dict["status_code"],
+            headers=headers,
+            content=json_dumps(res_dict["json"]),
+        )
+
+
+class HTTPRecorder(httpx.Client, _HTTPConversions, LLMRecorder):
+    """
+    An HTTP client that records and replays LLM API interactions.
+    Inherits from both httpx.Client and LLMRecorder.
+    """
+
+    def __init__(
+        self,
+        persistence: Union[str, Path, Persistence],
+        replay_count: int = 0,
+        cache_by_request: bool = False,
+        **kwargs,
+    ):
+        kwargs.setdefault("limits", _DEFAULT_LIMITS)
+        # Initialize both parent classes
+        httpx.Client.__init__(self, **kwargs)
+        LLMRecorder.__init__(
+            self, persistence, replay_count=replay_count, cache_by_request=cache_by_request
+        )
+
+    def live_call(self, **kwargs) -> httpx.Response:
+        """Make a live HTTP request using the parent httpx.Client"""
+
+        # Make the actual HTTP request
+        return super().send(**kwargs)
+
     def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
         """
         Override send method which is used by the OpenAI client.
         """
         kwargs["request"] = request
-        dict_response = self.dict_completion(**kwargs)
-        headers = dict_response.pop("headers")
-        headers.pop("content-encoding")
-        json_content = dict_response.pop("json")
-        text = json.dumps(json_content)
-        status_code = dict_response.pop("status_code")
-        response = httpx.Response(
-            status_code=status_code, headers=headers, request=request, text=text
+        response = self.response_completion(**kwargs)
+        response.request = request
+        return response
+
+
+class AsyncHTTPRecorder(httpx.AsyncClient, _HTTPConversions, AsyncLLMRecorder):
+    """
+    An async HTTP client that records and replays LLM API interactions.
+    Inherits from both httpx.AsyncClient and AsyncLLMRecorder.
+    """
+
+    def __init__(
+        self,
+        persistence: Union[str, Path, Persistence],
+        replay_count: int = 0,
+        cache_by_request: bool = False,
+        **kwargs,
+    ):
+        kwargs.setdefault("limits", _DEFAULT_LIMITS)
+        # Initialize both parent classes
+        httpx.AsyncClient.__init__(self, **kwargs)
+        LLMRecorder.__init__(
+            self, persistence, replay_count=replay_count, cache_by_request=cache_by_request
         )
+
+    async def alive_call(self, **kwargs) -> httpx.Response:
+        """Make a live HTTP request using the parent httpx.AsyncClient"""
+        return await super().send(**kwargs)
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        """
+        Override send method which is used by the AsyncOpenAI client.
+        """
+        kwargs["request"] = request
+        response = await self.aresponse_completion(**kwargs)
+        response.request = request
         return response
 
 
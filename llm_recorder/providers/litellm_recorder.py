@@ -1,13 +1,18 @@
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, List, Union
+import threading
 import litellm
 from llm_recorder import LLMRecorder, Persistence
+from llm_recorder.providers.chat_completions import choices_finished_normally
 from pathlib import Path
 
 # this is for monkey patching
 _rllm_instance: Optional["LitellmRecorder"] = None
+# Makes enable_replay_mode patch litellm once even when called from several threads
+_enable_lock = threading.Lock()
 
-# Store the original completion function
+# Store the original completion functions
 _original_completion = litellm.completion
+_original_acompletion = litellm.acompletion
 
 
 class LitellmRecorder(LLMRecorder):
@@ -22,6 +27,10 @@ class LitellmRecorder(LLMRecorder):
         """Make a live call to the LLM using the original completion function."""
         return _original_completion(**kwargs)
 
+    async def alive_call(self, **kwargs) -> litellm.ModelResponse:
+        """Make a live async call to the LLM using the original acompletion function."""
+        return await _original_acompletion(**kwargs)
+
     def req_to_dict(self, req: Dict[str, Any]) -> Dict[str, Any]:
         """Convert request to a dictionary format."""
         return req
@@ -30,37 +39,60 @@ class LitellmRecorder(LLMRecorder):
         """Convert LiteLLM response to a dictionary format."""
         return res.model_dump()
 
+    def dict_to_res(self, res_dict: Dict[str, Any]) -> litellm.ModelResponse:
+        """Convert a recorded dictionary back to a LiteLLM response."""
+        return litellm.ModelResponse(**res_dict)
+
+    def is_cacheable(self, res_dict: Dict[str, Any]) -> bool:
+        """Only reuse responses whose choices all finished normally."""
+        return choices_finished_normally(res_dict)
+
     # then we can implement the completion method for convenience
 
     def completion(self, **kwargs) -> litellm.ModelResponse:
-        dict_response = self.dict_completion(**kwargs)
-        litellm_message = litellm.ModelResponse(**dict_response)
-        return litellm_message
+        return self.response_completion(**kwargs)
+
+    async def acompletion(self, **kwargs) -> litellm.ModelResponse:
+        return await self.aresponse_completion(**kwargs)
+
+    def batch_completion(
+        self, many_kwargs: List[Dict[str, Any]], max_workers: Optional[int] = None
+    ) -> List[litellm.ModelResponse]:
+        return self.response_batch_completion(many_kwargs, max_workers=max_workers)
 
 
 def enable_replay_mode(
     persistence: Union[str, Path, Persistence],
     replay_count: int = 0,
+    cache_by_request: bool = False,
 ) -> None:
     """
-    Enable replay mode by creating a LiteLLMRecorder instance and monkey-patching litellm.completion.
+    Enable replay mode by creating a LiteLLMRecorder instance and monkey-patching
+    litellm.completion and litellm.acompletion.
 
     Args:
         persistence: Directory to load interactions from or a Persistence implementation.
         replay_count: Number of interactions to replay before making live calls.
+        cache_by_request: Reuse the response of an identical earlier request instead of making a live call.
     """
     global _rllm_instance
 
-    if _rllm_instance is not None:
-        # Already enabled, do nothing
-        return
+    with _enable_lock:
+        if _rllm_instance is not None:
+            # Already enabled, do nothing
+            return
+
+        _rllm_instance = LitellmRecorder(
+            persistence=persistence,
+            replay_count=replay_count,
+            cache_by_request=cache_by_request,
+        )
 
-    _rllm_instance = LitellmRecorder(
-        persistence=persistence,
-        replay_count=replay_count,
-    )
+        def patched_completion(**kwargs):
+            return _rllm_instance.completion(**kwargs)
 
-    def patched_completion(**kwargs):
-        return _rllm_instance.completion(**kwargs)
+        async def patched_acompletion(**kwargs):
+            return await _rllm_instance.acompletion(**kwargs)
 
-    litellm.completion = patched_completion
+        litellm.completion = patched_completion
+        litellm.acompletion = patched_acompletion
@@ -1,11 +1,13 @@
 from typing import Dict, Any, Union
 from pathlib import Path
-from ..llm_recorder import LLMRecorder, Persistence
+from ..llm_recorder import LLMRecorder, AsyncLLMRecorder, Persistence
+from .chat_completions import choices_finished_normally
+from .pydantic_conversions import PydanticConversions
 
 from functools import cached_property
 
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     from openai.resources import chat
     from openai.resources.chat import completions
     from openai.types.chat import ChatCompletion
@@ -16,7 +18,17 @@ except ImportError:
     )
 
 
-class CompletionsRecorder(completions.Completions, LLMRecorder):
+class _ChatCompletionConversions(PydanticConversions):
+    """Chat completion conversions, and which completions the request cache may reuse"""
+
+    response_model = ChatCompletion
+
+    def is_cacheable(self, res_dict: Dict[str, Any]) -> bool:
+        """Only reuse completions whose choices all finished normally"""
+        return choices_finished_normally(res_dict)
+
+
+class CompletionsRecorder(completions.Completions, _ChatCompletionConversions, LLMRecorder):
     """Subclass of OpenAI Completions that uses LLMRecorder for create calls"""
 
     def __init__(
@@ -24,6 +36,7 @@ class CompletionsRecorder(completions.Completions, LLMRecorder):
         client: OpenAI,
         persistence: Union[str, Path, Persistence],
         replay_count: int = 0,
+        cache_by_request: bool = False,
         **kwargs,
     ):
         super().__init__(client=client, **kwargs)
@@ -31,6 +44,7 @@ class CompletionsRecorder(completions.Completions, LLMRecorder):
             self,
             persistence,
             replay_count=replay_count,
+            cache_by_request=cache_by_request,
         )
 
     def live_call(self, **kwargs) -> ChatCompletion:
@@ -39,14 +53,37 @@ class CompletionsRecorder(completions.Completions, LLMRecorder):
         return response
 
     def create(self, **kwargs) -> ChatCompletion:
-        dict_response = self.dict_completion(**kwargs)
-        return ChatCompletion.model_validate(dict_response)
+        return self.response_completion(**kwargs)
+
+
+class AsyncCompletionsRecorder(
+    completions.AsyncCompletions, _ChatCompletionConversions, AsyncLLMRecorder
+):
+    """Subclass of OpenAI AsyncCompletions that uses LLMRecorder for create calls"""
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        persistence: Union[str, Path, Persistence],
+        replay_count: int = 0,
+        cache_by_request: bool = False,
+        **kwargs,
+    ):
+        super().__init__(client=client, **kwargs)
+        LLMRecorder.__init__(
+            self,
+            persistence,
+            replay_count=replay_count,
+            cache_by_request=cache_by_request,
+        )
 
-    def req_to_dict(self, req: Dict[str, Any]) -> Dict[str, Any]:
-        return req
+    async def alive_call(self, **kwargs) -> ChatCompletion:
+        """Make a live API call to OpenAI"""
+        response = await super().create(**kwargs)
+        return response
 
-    def res_to_dict(self, res: ChatCompletion) -> Dict[str, Any]:
-        return res.model_dump()
+    async def create(self, **kwargs) -> ChatCompletion:
+        return await self.aresponse_completion(**kwargs)
 
 
 class ChatRecorder(chat.Chat):
@@ -57,10 +94,12 @@ class ChatRecorder(chat.Chat):
         client: OpenAI,
         persistence: Union[str, Path, Persistence],
         replay_count: int = 0,
+        cache_by_request: bool = False,
     ):
         super().__init__(client=client)
         self._persistence = persistence
         self._replay_count = replay_count
+        self._cache_by_request = cache_by_request
 
     @cached_property
     def completions(self) -> CompletionsRecorder:
@@ -68,6 +107,32 @@ class ChatRecorder(chat.Chat):
             self._client,
             self._persistence,
             replay_count=self._replay_count,
+            cache_by_request=self._cache_by_request,
+        )
+
+
+class AsyncChatRecorder(chat.AsyncChat):
+    """Subclass of OpenAI AsyncChat that uses LLMRecorder for create calls"""
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        persistence: Union[str, Path, Persistence],
+        replay_count: int = 0,
+        cache_by_request: bool = False,
+    ):
+        super().__init__(client=client)
+        self._persistence = persistence
+        self._replay_count = replay_count
+        self._cache_by_request = cache_by_request
+
+    @cached_property
+    def completions(self) -> AsyncCompletionsRecorder:
+        return AsyncCompletionsRecorder(
+            self._client,
+            self._persistence,
+            replay_count=self._replay_count,
+            cache_by_request=self._cache_by_request,
         )
 
 
@@ -78,6 +143,7 @@ class OpenAIRecorder(OpenAI):
         self,
         persistence: Union[str, Path, Persistence],
         replay_count: int = 0,
+        cache_by_request: bool = False,
         **kwargs,
     ):
         """
@@ -86,6 +152,7 @@ class OpenAIRecorder(OpenAI):
         Args:
             persistence: Either a Persistence implementation or a path (str/Path) for default FilePersistence
             replay_count: Number of interactions to replay before making live calls
+            cache_by_request: Reuse the response of an identical earlier request instead of making a live call
             **kwargs: Additional arguments passed to OpenAI client
         """
         super().__init__(**kwargs)
@@ -95,4 +162,35 @@ class OpenAIRecorder(OpenAI):
             client=self,
             persistence=persistence,
             replay_count=replay_count,
+            cache_by_request=cache_by_request,
+        )
+
+
+class AsyncOpenAIRecorder(AsyncOpenAI):
+    """Async OpenAI client that supports replaying chat completions"""
+
+    def __init__(
+        self,
+        persistence: Union[str, Path, Persistence],
+        replay_count: int = 0,
+        cache_by_request: bool = False,
+        **kwargs,
+    ):
+        """
+        Initialize AsyncOpenAIRecorder.
+
+        Args:
+            persistence: Either a Persistence implementation or a path (str/Path) for default FilePersistence
+            replay_count: Number of interactions to replay before making live calls
+            cache_by_request: Reuse the response of an identical earlier request instead of making a live call
+            **kwargs: Additional arguments passed to AsyncOpenAI client
+        """
+        super().__init__(**kwargs)
+
+        # Create new chat instance with replay support
+        self.chat = AsyncChatRecorder(
+            client=self,
+            persistence=persistence,
+            replay_count=replay_count,
+            cache_by_request=cache_by_request,
         )
@@ -0,0 +1,21 @@
+from typing import Any, ClassVar, Dict, Type
+from pydantic import BaseModel
+
+
+class PydanticConversions:
+    """
+    Conversions for SDKs that take keyword arguments and return pydantic models.
+    Subclasses set response_model to the model their live calls return.
+    """
+
+    response_model: ClassVar[Type[BaseModel]]
+
+    def req_to_dict(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        return req
+
+    def res_to_dict(self, res: BaseModel) -> Dict[str, Any]:
+        # Only the fields the API actually returned, which model_validate restores as is
+        return res.model_dump(exclude_unset=True, exclude_none=True)
+
+    def dict_to_res(self, res_dict: Dict[str, Any]) -> BaseModel:
+        return self.response_model.model_validate(res_dict)
@@ -0,0 +1,130 @@
+import pytest
+
+pytest.importorskip("anthropic")
+
+try:
+    # Recent anthropic releases are built on httpx2 and reject httpx clients
+    import httpx2 as httpx
+except ImportError:
+    import httpx
+import asyncio
+from anthropic.types import Message
+from llm_recorder.providers.anthropic_recorder import ReplayAnthropic, AsyncReplayAnthropic
+
+
+MESSAGE = {
+    "id": "msg_123",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-3-5-haiku-latest",
+    "content": [{"type": "text", "text": "Hello there!"}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 9, "output_tokens": 12},
+}
+
+TOOL_USE_MESSAGE = {
+    **MESSAGE,
+    "id": "msg_456",
+    "content": [
+        {"type": "tool_use", "id": "toolu_1", "name": "get_weather", "input": {"city": "Paris"}}
+    ],
+    "stop_reason": "tool_use",
+}
+
+REQUEST = {
+    "model": "claude-3-5-haiku-latest",
+    "max_tokens": 100,
+    "messages": [{"role": "user", "content": "Hello"}],
+}
+
+
+def test_cache_by_request_reuses_identical_requests(tmp_path, mock_transport):
+    requests = []
+    client = ReplayAnthropic(
+        tmp_path,
+        cache_by_request=True,
+        api_key="test",
+        http_client=httpx.Client(transport=mock_transport(requests, MESSAGE, httpx)),
+    )
+
+    first = client.messages.create(**REQUEST)
+    second = client.messages.create(**REQUEST)
+
+    assert len(requests) == 1
+    assert second == first
+    # The reused response is still recorded
+    assert (tmp_path / "2.response.json").exists()
+
+
+def test_is_cacheable_checks_stop_reason(tmp_path):
+    recorder = ReplayAnthropic(tmp_path, api_key="test").messages
+
+    assert recorder.is_cacheable({"stop_reason": "end_turn"})
+    assert recorder.is_cacheable({"stop_reason": "tool_use"})
+    assert not recorder.is_cacheable({"stop_reason": None})
+    assert not recorder.is_cacheable({})
+
+
+def test_cache_by_request_skips_unfinished_messages(tmp_path, mock_transport):
+    requests = []
+    client = ReplayAnthropic(
+        tmp_path,
+        cache_by_request=True,
+        api_key="test",
+        http_client=httpx.Client(
+            transport=mock_transport(requests, {**MESSAGE, "stop_reason": None}, httpx)
+        ),
+    )
+
+    client.messages.create(**REQUEST)
+    client.messages.create(**REQUEST)
+
+    assert len(requests) == 2
+
+
+def test_async_client_records_and_replays(tmp_path, mock_transport):
+    requests = []
+
+    async def create(replay_count):
+        client = AsyncReplayAnthropic(
+            tmp_path,
+            replay_count=replay_count,
+            api_key="test",
+            http_client=httpx.AsyncClient(transport=mock_transport(requests, MESSAGE, httpx)),
+        )
+        return await client.messages.create(**REQUEST)
+
+    live = asyncio.run(create(0))
+    replayed = asyncio.run(create(1))
+
+    assert len(requests) == 1
+    assert replayed == live
+
+
+@pytest.mark.parametrize("message", [MESSAGE, TOOL_USE_MESSAGE])
+def test_recorded_message_round_trips(tmp_path, message):
+    recorder = ReplayAnthropic(tmp_path, api_key="test").messages
+    response = Message.model_validate(message)
+
+    assert recorder.dict_to_res(recorder.res_to_dict(response)) == response
+
+
+def test_replayed_tool_use_equals_live_response(tmp_path, mock_transport):
+    requests = []
+
+    def create(replay_count):
+        client = ReplayAnthropic(
+            tmp_path,
+            replay_count=replay_count,
+            api_key="test",
+            http_client=httpx.Client(transport=mock_transport(requests, TOOL_USE_MESSAGE, httpx)),
+        )
+        return client.messages.create(**REQUEST)
+
+    live = create(0)
+    replayed = create(1)
+
+    assert len(requests) == 1
+    assert replayed == live
+    assert replayed.stop_sequence is None
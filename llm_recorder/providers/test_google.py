@@ -0,0 +1,11 @@
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+from llm_recorder.providers.google_recorder import RecorderGenerativeModel
+
+
+def test_cache_by_request_is_passed_to_the_recorder(tmp_path):
+    model = RecorderGenerativeModel("gemini-pro", tmp_path, cache_by_request=True)
+
+    assert model.cache_by_request
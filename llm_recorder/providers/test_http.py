@@ -0,0 +1,86 @@
+import asyncio
+import json
+import httpx
+from llm_recorder.providers.http_recorder import HTTPRecorder, AsyncHTTPRecorder
+
+
+URL = "https://api.example.com/v1/chat/completions"
+BODY = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Hello"}]}
+RESPONSE = {"choices": [{"message": {"content": "Hello there!"}, "finish_reason": "stop"}]}
+
+
+def test_cache_by_request_reuses_identical_requests(tmp_path, mock_transport):
+    requests = []
+    client = HTTPRecorder(
+        tmp_path, cache_by_request=True, transport=mock_transport(requests, RESPONSE)
+    )
+
+    first = client.post(URL, json=BODY)
+    second = client.post(URL, json=BODY)
+
+    assert len(requests) == 1
+    assert second.json() == first.json() == RESPONSE
+    # The reused response is still recorded
+    assert (tmp_path / "2.response.json").exists()
+
+
+def test_async_recorder_records_and_replays(tmp_path, mock_transport):
+    requests = []
+
+    async def post(replay_count):
+        async with AsyncHTTPRecorder(
+            tmp_path, replay_count=replay_count, transport=mock_transport(requests, RESPONSE)
+        ) as client:
+            return await client.post(URL, json=BODY)
+
+    live = asyncio.run(post(0))
+    replayed = asyncio.run(post(1))
+
+    assert len(requests) == 1
+    assert replayed.status_code == live.status_code == 200
+    assert replayed.json() == live.json() == RESPONSE
+    assert replayed.request.url == URL
+
+
+def test_repeated_headers_survive_record_and_replay(tmp_path):
+    def handler(request):
+        headers = [("set-cookie", "a=1"), ("set-cookie", "b=2")]
+        return httpx.Response(200, headers=headers, json=RESPONSE)
+
+    def post(replay_count):
+        client = HTTPRecorder(
+            tmp_path, replay_count=replay_count, transport=httpx.MockTransport(handler)
+        )
+        return client.post(URL, json=BODY)
+
+    post(0)
+    replayed = post(1)
+
+    assert replayed.headers.get_list("set-cookie") == ["a=1", "b=2"]
+
+
+def test_replays_recordings_with_headers_stored_as_dict(tmp_path):
+    # Recordings made before headers were stored as name/value pairs
+    request = {"method": "POST", "url": URL, "headers": {}, "json": BODY, "kwargs": {}}
+    response = {"status_code": 200, "headers": {"x-request-id": "req_1"}, "json": RESPONSE}
+    (tmp_path / "1.request.json").write_text(json.dumps(request))
+    (tmp_path / "1.response.json").write_text(json.dumps(response))
+
+    replayed = HTTPRecorder(tmp_path, replay_count=1).post(URL, json=BODY)
+
+    assert replayed.headers["x-request-id"] == "req_1"
+    assert replayed.json() == RESPONSE
+
+
+def test_replayed_content_length_matches_the_rebuilt_body(tmp_path):
+    # The live body was compressed and formatted differently from the re-encoded JSON
+    request = {"method": "POST", "url": URL, "headers": {}, "json": BODY, "kwargs": {}}
+    headers = [("content-encoding", "gzip"), ("content-length", "9999")]
+    response = {"status_code": 200, "headers": headers, "json": RESPONSE}
+    (tmp_path / "1.request.json").write_text(json.dumps(request))
+    (tmp_path / "1.response.json").write_text(json.dumps(response))
+
+    replayed = HTTPRecorder(tmp_path, replay_count=1).post(URL, json=BODY)
+
+    assert replayed.headers["content-length"] == str(len(replayed.content))
+    assert replayed.json() == RESPONSE
@@ -1,26 +1,52 @@
-from pathlib import Path
-import tempfile
+import asyncio
 import litellm
+from llm_recorder import LLMInteraction
 import llm_recorder.providers.litellm_recorder as litellm_recorder
 
 
-def test_enable_replay_mode():
-    # Create a temporary directory for the test
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
+def test_enable_replay_mode(tmp_path):
+    # Store original completion function
+    original_completion = litellm.completion
 
-        # Store original completion function
-        original_completion = litellm.completion
+    # Enable replay mode
+    litellm_recorder.enable_replay_mode(tmp_path)
 
-        # Enable replay mode
-        litellm_recorder.enable_replay_mode(temp_path)
+    # Check that _rllm_instance was created and is the correct type
+    assert litellm_recorder._rllm_instance is not None
+    assert isinstance(
+        litellm_recorder._rllm_instance, litellm_recorder.LitellmRecorder
+    )
 
-        # Check that _rllm_instance was created and is the correct type
-        assert litellm_recorder._rllm_instance is not None
-        assert isinstance(
-            litellm_recorder._rllm_instance, litellm_recorder.LitellmRecorder
-        )
+    # Check that litellm.completion has been changed
+    assert litellm.completion != original_completion
+    assert litellm.completion.__name__ == "patched_completion"
+    assert litellm.acompletion.__name__ == "patched_acompletion"
 
-        # Check that litellm.completion has been changed
-        assert litellm.completion != original_completion
-        assert litellm.completion.__name__ == "patched_completion"
+
+def test_is_cacheable_checks_finish_reason(tmp_path):
+    recorder = litellm_recorder.LitellmRecorder(tmp_path)
+
+    assert recorder.is_cacheable({"choices": [{"finish_reason": "stop"}]})
+    assert not recorder.is_cacheable({"choices": [{"finish_reason": None}]})
+    assert not recorder.is_cacheable({"choices": []})
+
+
+def test_acompletion_replays_recorded_response(tmp_path):
+    kwargs = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Hi"}]}
+    response = litellm.ModelResponse(
+        choices=[{"message": {"role": "assistant", "content": "Hello!"}, "finish_reason": "stop"}]
+    )
+    litellm_recorder.LitellmRecorder(tmp_path).persistence.save(
+        LLMInteraction(
+            timestamp="2024-01-01T00:00:00",
+            request=kwargs,
+            response=response.model_dump(),
+        ),
+        1,
+    )
+
+    recorder = litellm_recorder.LitellmRecorder(tmp_path, replay_count=1)
+    replayed = asyncio.run(recorder.acompletion(**kwargs))
+
+    assert isinstance(replayed, litellm.ModelResponse)
+    assert replayed.choices[0].message.content == "Hello!"
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import shutil
+from pathlib import Path
+import httpx
+import pytest
+from openai.types.chat import ChatCompletion
+from llm_recorder.providers.openai_recorder import OpenAIRecorder, AsyncOpenAIRecorder
+
+
+EXAMPLE_SAVES = Path(__file__).parents[2] / "examples" / "saves" / "openai"
+
+
+CHAT_COMPLETION = {
+    "id": "chatcmpl-123",
+    "object": "chat.completion",
+    "created": 1677652288,
+    "model": "gpt-4o-mini",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "Hello there!"},
+            "finish_reason": "stop",
+        }
+    ],
+}
+
+TOOL_CALL_COMPLETION = {
+    "id": "chatcmpl-456",
+    "object": "chat.completion",
+    "created": 1677652288,
+    "model": "gpt-4o-mini",
+    "choices": [
+        {
+            "index": 0,
+            "logprobs": None,
+            "message": {
+                "role": "assistant",
+                "content": None,
+                "refusal": None,
+                "tool_calls": [
+                    {
+                        "id": "call_1",
+                        "type": "function",
+                        "function": {"name": "get_weather", "arguments": '{"city": "Paris"}'},
+                    }
+                ],
+            },
+            "finish_reason": "tool_calls",
+        }
+    ],
+    "usage": {"prompt_tokens": 9, "completion_tokens": 12, "total_tokens": 21},
+}
+
+REQUEST = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Hello"}]}
+
+
+def test_cache_by_request_reuses_identical_requests(tmp_path, mock_transport):
+    requests = []
+    client = OpenAIRecorder(
+        tmp_path,
+        cache_by_request=True,
+        api_key="test",
+        http_client=httpx.Client(transport=mock_transport(requests, CHAT_COMPLETION)),
+    )
+
+    first = client.chat.completions.create(**REQUEST)
+    second = client.chat.completions.create(**REQUEST)
+
+    assert len(requests) == 1
+    assert second == first
+    # The reused response is still recorded
+    assert (tmp_path / "2.response.json").exists()
+
+
+def test_is_cacheable_checks_finish_reason(tmp_path):
+    recorder = OpenAIRecorder(tmp_path, api_key="test").chat.completions
+
+    assert recorder.is_cacheable({"choices": [{"finish_reason": "stop"}]})
+    assert recorder.is_cacheable({"choices": [{"finish_reason": "tool_calls"}]})
+    assert not recorder.is_cacheable({"choices": [{"finish_reason": None}]})
+    assert not recorder.is_cacheable({"choices": []})
+
+
+def test_cache_by_request_skips_unfinished_completions(tmp_path, mock_transport):
+    unfinished = {
+        **CHAT_COMPLETION,
+        "choices": [{**CHAT_COMPLETION["choices"][0], "finish_reason": None}],
+    }
+    requests = []
+    client = OpenAIRecorder(
+        tmp_path,
+        cache_by_request=True,
+        api_key="test",
+        http_client=httpx.Client(transport=mock_transport(requests, unfinished)),
+    )
+
+    client.chat.completions.create(**REQUEST)
+    client.chat.completions.create(**REQUEST)
+
+    assert len(requests) == 2
+
+
+def test_async_client_replays_example_saves_then_records(tmp_path, mock_transport):
+    shutil.copytree(EXAMPLE_SAVES, tmp_path, dirs_exist_ok=True)
+    requests = []
+    client = AsyncOpenAIRecorder(
+        tmp_path,
+        replay_count=2,
+        api_key="test",
+        http_client=httpx.AsyncClient(transport=mock_transport(requests, CHAT_COMPLETION)),
+    )
+
+    async def run():
+        responses = []
+        for index in (1, 2):
+            kwargs = json.loads((EXAMPLE_SAVES / f"{index}.request.json").read_text())
+            responses.append(await client.chat.completions.create(**kwargs))
+        responses.append(await client.chat.completions.create(**REQUEST))
+        return responses
+
+    first, second, live = asyncio.run(run())
+
+    for index, response in ((1, first), (2, second)):
+        recorded = json.loads((EXAMPLE_SAVES / f"{index}.response.json").read_text())
+        assert response.choices[0].message.content == recorded["choices"][0]["message"]["content"]
+    assert len(requests) == 1
+    assert live.choices[0].message.content == "Hello there!"
+    assert json.loads((tmp_path / "3.request.json").read_text()) == REQUEST
+
+
+@pytest.mark.parametrize("completion", [CHAT_COMPLETION, TOOL_CALL_COMPLETION])
+def test_recorded_completion_round_trips(tmp_path, completion):
+    recorder = OpenAIRecorder(tmp_path, api_key="test").chat.completions
+    response = ChatCompletion.model_validate(completion)
+
+    assert recorder.dict_to_res(recorder.res_to_dict(response)) == response
+
+
+def test_replayed_tool_call_equals_live_response(tmp_path, mock_transport):
+    requests = []
+
+    def create(replay_count):
+        client = OpenAIRecorder(
+            tmp_path,
+            replay_count=replay_count,
+            api_key="test",
+            http_client=httpx.Client(transport=mock_transport(requests, TOOL_CALL_COMPLETION)),
+        )
+        return client.chat.completions.create(**REQUEST)
+
+    live = create(0)
+    replayed = create(1)
+
+    assert len(requests) == 1
+    assert replayed == live
+    assert replayed.choices[0].message.content is None
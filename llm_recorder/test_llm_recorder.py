@@ -1,57 +1,55 @@
+import json
 import pytest
 from pathlib import Path
-import tempfile
-from llm_recorder.llm_recorder import LLMRecorder, LLMInteraction, FilePersistence
-from dataclasses import dataclass
+from llm_recorder.llm_recorder import (
+    LLMRecorder,
+    AsyncLLMRecorder,
+    LLMInteraction,
+    FilePersistence,
+    JsonlPersistence,
+    SqlitePersistence,
+)
+from dataclasses import dataclass, asdict
 from typing import Any, Dict
-from datetime import datetime
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+# Fixed so that seeded recordings are identical from run to run
+FIXED_TIMESTAMP = "2024-01-01T00:00:00"
 
-@pytest.fixture
-def temp_dir():
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        yield Path(tmpdirname)
 
+@pytest.fixture(
+    params=["files", "interactions.jsonl", "interactions.jsonl.gz", "interactions.sqlite"]
+)
+def make_persistence(request, tmp_path):
+    """Factory of persistence instances of one backend that all use the same store"""
 
-@pytest.fixture
-def sample_request():
-    return {
-        "model": "gpt-3.5-turbo",
-        "messages": [{"role": "user", "content": "Hello"}],
-    }
+    def make():
+        if request.param == "files":
+            return FilePersistence(tmp_path)
+        if request.param.endswith(".sqlite"):
+            return SqlitePersistence(tmp_path / request.param)
+        return JsonlPersistence(tmp_path / request.param)
 
-
-@pytest.fixture
-def sample_response():
-    return {
-        "id": "chatcmpl-123",
-        "object": "chat.completion",
-        "created": 1677652288,
-        "choices": [
-            {
-                "index": 0,
-                "message": {"role": "assistant", "content": "Hello there!"},
-                "finish_reason": "stop",
-            }
-        ],
-        "usage": {"prompt_tokens": 9, "completion_tokens": 12, "total_tokens": 21},
-    }
+    return make
 
 
 def create_interaction_files(directory: Path, request: dict, response: dict):
     """Helper to create interaction files in a directory"""
     persistence = FilePersistence(directory)
     interaction = LLMInteraction(
-        timestamp=datetime.now().isoformat(), request=request, response=response
+        timestamp=FIXED_TIMESTAMP, request=request, response=response
     )
     persistence.save(interaction, 1)
 
 
-def test_save_and_load_interaction(temp_dir):
-    persistence = FilePersistence(temp_dir)
+def test_save_and_load_interaction(tmp_path):
+    persistence = FilePersistence(tmp_path)
 
     interaction = LLMInteraction(
-        timestamp="2024-01-01T00:00:00",
+        timestamp=FIXED_TIMESTAMP,
         request={
             "model": "gpt-3.5-turbo",
             "messages": [{"role": "user", "content": "Hello"}],
@@ -62,15 +60,62 @@ def test_save_and_load_interaction(temp_dir):
     # Save the interaction
     persistence.save(interaction, 1)
 
-    # Load all interactions (limit=1 since we only saved one)
-    loaded_interactions = persistence.load_all(limit=1)
-
-    assert len(loaded_interactions) == 1
-    loaded = loaded_interactions[0]
+    # Load it back by index
+    loaded = persistence.load(1)
 
     # Compare the dictionaries
     assert loaded.request == interaction.request
     assert loaded.response == interaction.response
+    # The files don't store the timestamp
+    assert loaded.timestamp == ""
+
+
+def test_load_raises_for_missing_response_file(tmp_path, sample_request, sample_response):
+    persistence = FilePersistence(tmp_path)
+    persistence.save(
+        LLMInteraction(timestamp="", request=sample_request, response=sample_response), 1
+    )
+    (tmp_path / "1.response.json").unlink()
+
+    with pytest.raises(FileNotFoundError):
+        persistence.load(1)
+
+
+@pytest.mark.parametrize("pretty", [True, False])
+def test_save_pretty_or_compact(tmp_path, sample_request, sample_response, pretty):
+    persistence = FilePersistence(tmp_path, pretty=pretty)
+    persistence.save(
+        LLMInteraction(timestamp="", request=sample_request, response=sample_response), 1
+    )
+
+    assert (b"\n" in (tmp_path / "1.response.json").read_bytes()) == pretty
+    assert persistence.load_all(limit=1)[0].response == sample_response
+
+
+def test_load_per_key_interaction_files(tmp_path, sample_request, sample_response):
+    # Layout written by earlier versions: one file per top-level key
+    for kind, data in (("request", sample_request), ("response", sample_response)):
+        for key, value in data.items():
+            (tmp_path / f"1.{kind}_{key}.json").write_text(json.dumps(value))
+
+    persistence = FilePersistence(tmp_path)
+    loaded_interactions = persistence.load_all(limit=1)
+
+    assert len(loaded_interactions) == 1
+    assert loaded_interactions[0].request == sample_request
+    assert loaded_interactions[0].response == sample_response
+    assert persistence.load(1) == loaded_interactions[0]
+
+
+def test_load_all_reads_interactions_lazily(tmp_path, sample_request, sample_response):
+    create_interaction_files(tmp_path, sample_request, sample_response)
+
+    loaded_interactions = FilePersistence(tmp_path).load_all(limit=1)
+    # Edits made after load_all are still picked up on first access
+    (tmp_path / "1.response.json").write_text('{"id": "edited"}')
+
+    assert len(loaded_interactions) == 1
+    assert loaded_interactions[0].response["id"] == "edited"
 
 
 @dataclass
@@ -97,12 +142,65 @@ class MockReplayLLM(LLMRecorder):
         return res
 
 
-def test_replay_llm_replay_mode(temp_dir, sample_request, sample_response):
-    # Create interaction files
-    create_interaction_files(temp_dir, sample_request, sample_response)
+class MockObjectReplayLLM(MockReplayLLM):
+    """Test implementation of LLMRecorder with response objects"""
+
+    def live_call(self, **kwargs) -> MockResponse:
+        return MockResponse(content="This is a live response")
+
+    def res_to_dict(self, res: MockResponse) -> Dict[str, Any]:
+        return asdict(res)
+
+    def dict_to_res(self, res_dict: Dict[str, Any]) -> MockResponse:
+        return MockResponse(**res_dict)
+
+
+def test_response_completion_returns_live_or_rebuilt_response(tmp_path, sample_request):
+    llm = MockObjectReplayLLM(tmp_path, replay_count=0)
+    live_response = llm.response_completion(**sample_request)
+
+    replay_llm = MockObjectReplayLLM(tmp_path, replay_count=1)
+    replayed_response = replay_llm.response_completion(**sample_request)
+
+    assert isinstance(live_response, MockResponse)
+    assert replayed_response == live_response
+    assert replayed_response is not live_response
+
+
+class MockAsyncReplayLLM(AsyncLLMRecorder):
+    """Test implementation of AsyncLLMRecorder"""
+
+    async def alive_call(self, **kwargs) -> dict:
+        return {"choices": [{"message": {"content": "This is an async live response"}}]}
+
+    def req_to_dict(self, req: Any) -> Dict[str, Any]:
+        return req
+
+    def res_to_dict(self, res: Any) -> Dict[str, Any]:
+        return res
+
+
+def test_async_completion_records_and_replays(tmp_path, sample_request):
+    llm = MockAsyncReplayLLM(tmp_path, replay_count=0)
+    live_response = asyncio.run(llm.adict_completion(**sample_request))
+
+    replay_llm = MockAsyncReplayLLM(tmp_path, replay_count=1)
+    replayed_response = asyncio.run(replay_llm.aresponse_completion(**sample_request))
+
+    assert replayed_response == live_response
+    with pytest.raises(NotImplementedError):
+        replay_llm.dict_completion(**sample_request)
+
+
+def test_replay_llm_replay_mode(make_persistence, sample_request, sample_response):
+    # Save an interaction
+    make_persistence().save(
+        LLMInteraction(timestamp=FIXED_TIMESTAMP, request=sample_request, response=sample_response),
+        1,
+    )
 
     # Initialize LLMRecorder in replay mode
-    llm = MockReplayLLM(temp_dir, replay_count=1)
+    llm = MockReplayLLM(make_persistence(), replay_count=1)
 
     # Get response - should be from replay
     response = llm.dict_completion(**sample_request)
@@ -111,9 +209,9 @@ def test_replay_llm_replay_mode(temp_dir, sample_request, sample_response):
     assert response["choices"][0]["message"]["content"] == "Hello there!"
 
 
-def test_replay_llm_live_mode(temp_dir):
+def test_replay_llm_live_mode(tmp_path):
     # Initialize LLMRecorder with no replay interactions
-    llm = MockReplayLLM(temp_dir, replay_count=0)
+    llm = MockReplayLLM(tmp_path, replay_count=0)
 
     # Get response - should be live
     response = llm.dict_completion(messages=[{"role": "user", "content": "Hi"}])
@@ -122,45 +220,371 @@ def test_replay_llm_live_mode(temp_dir):
     assert response["choices"][0]["message"]["content"] == "This is a live response"
 
 
-def test_replay_llm_saves_interactions(temp_dir, sample_request):
+def test_replay_llm_saves_interactions(tmp_path, sample_request):
     # Initialize LLMRecorder
-    llm = MockReplayLLM(temp_dir, replay_count=0)
+    llm = MockReplayLLM(tmp_path, replay_count=0)
 
     # Make a call
     llm.dict_completion(**sample_request)
 
     # Check that files were saved
-    assert list(
-        temp_dir.glob("1.request_*.json")
-    )  # Should find at least one request file
-    assert list(
-        temp_dir.glob("1.response_*.json")
-    )  # Should find at least one response file
+    assert (tmp_path / "1.request.json").exists()
+    assert (tmp_path / "1.response.json").exists()
 
 
-def test_replay_llm_invalid_replay_count(temp_dir, sample_request, sample_response):
-    # Create one interaction
-    create_interaction_files(temp_dir, sample_request, sample_response)
+def test_replay_llm_invalid_replay_count(make_persistence, sample_request, sample_response):
+    # Save one interaction
+    make_persistence().save(
+        LLMInteraction(timestamp=FIXED_TIMESTAMP, request=sample_request, response=sample_response),
+        1,
+    )
 
     # Try to replay more interactions than exist
     with pytest.raises(ValueError, match="Cannot replay \(2\) interactions - there are only \(1\) available"):
-        MockReplayLLM(temp_dir, replay_count=2)
+        MockReplayLLM(make_persistence(), replay_count=2)
 
 
-def test_replay_llm_continues_numbering(temp_dir, sample_request, sample_response):
+def test_replay_llm_continues_numbering(tmp_path, sample_request, sample_response):
     # Create two interaction files
-    create_interaction_files(temp_dir, sample_request, sample_response)
+    create_interaction_files(tmp_path, sample_request, sample_response)
 
     # Initialize LLMRecorder
-    llm = MockReplayLLM(temp_dir, replay_count=1)
+    llm = MockReplayLLM(tmp_path, replay_count=1)
 
     llm.dict_completion(**sample_request)
     # Make a new live call
     llm.dict_completion(**sample_request)
 
     # The first interaction should be resaved
-    assert list(temp_dir.glob("1.request_*.json"))
-    assert list(temp_dir.glob("1.response_*.json"))
+    assert (tmp_path / "1.request.json").exists()
+    assert (tmp_path / "1.response.json").exists()
     # The second interaction should be saved
-    assert list(temp_dir.glob("2.request_*.json"))
-    assert list(temp_dir.glob("2.response_*.json"))
+    assert (tmp_path / "2.request.json").exists()
+    assert (tmp_path / "2.response.json").exists()
+
+
+def test_jsonl_save_and_load_interaction(tmp_path, sample_request, sample_response):
+    path = tmp_path / "interactions.jsonl"
+    persistence = JsonlPersistence(path)
+    for index in (1, 2):
+        persistence.save(
+            LLMInteraction(timestamp="", request=sample_request, response=sample_response),
+            index,
+        )
+
+    loaded_interactions = JsonlPersistence(path).load_all(limit=1)
+
+    assert len(loaded_interactions) == 1
+    assert loaded_interactions[0].request == sample_request
+    assert loaded_interactions[0].response == sample_response
+    # Records past the limit are dropped from the file
+    assert len(path.read_bytes().splitlines()) == 1
+
+
+@pytest.mark.parametrize("filename", ["interactions.jsonl", "interactions.jsonl.gz"])
+def test_jsonl_skips_partial_last_record(tmp_path, sample_request, sample_response, filename):
+    path = tmp_path / filename
+    persistence = JsonlPersistence(path)
+    interaction = LLMInteraction(
+        timestamp=FIXED_TIMESTAMP, request=sample_request, response=sample_response
+    )
+    persistence.save(interaction, 1)
+    # An append interrupted halfway through the second record
+    record = persistence._encode({"index": 2, "request": sample_request, "response": {}})
+    with open(path, "ab") as f:
+        f.write(record[: len(record) // 2])
+
+    reloaded = JsonlPersistence(path)
+    assert reloaded.load_all(limit=2) == [interaction]
+
+    # The partial record is gone, so new appends are readable again
+    reloaded.save(interaction, 2)
+    assert JsonlPersistence(path).load_all(limit=2) == [interaction, interaction]
+
+
+def test_jsonl_load_all_keeps_file_when_nothing_is_dropped(
+    tmp_path, sample_request, sample_response
+):
+    path = tmp_path / "interactions.jsonl"
+    JsonlPersistence(path).save(
+        LLMInteraction(timestamp="", request=sample_request, response=sample_response), 1
+    )
+    inode = path.stat().st_ino
+
+    JsonlPersistence(path).load_all(limit=1)
+
+    assert path.stat().st_ino == inode
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_sqlite_save_and_load_interaction(tmp_path, sample_request, sample_response):
+    path = tmp_path / "interactions.sqlite"
+    persistence = SqlitePersistence(path)
+    for index in (1, 2):
+        persistence.save(
+            LLMInteraction(timestamp="", request=sample_request, response=sample_response),
+            index,
+        )
+
+    reloaded = SqlitePersistence(path)
+    loaded_interactions = reloaded.load_all(limit=1)
+
+    assert len(loaded_interactions) == 1
+    assert loaded_interactions[0].request == sample_request
+    assert loaded_interactions[0].response == sample_response
+    # Rows past the limit are dropped
+    assert len(reloaded.load_all(limit=2)) == 1
+
+
+def test_sqlite_load_of_dropped_row_raises(tmp_path, sample_request, sample_response):
+    path = tmp_path / "interactions.sqlite"
+    persistence = SqlitePersistence(path)
+    persistence.save(
+        LLMInteraction(timestamp="", request=sample_request, response=sample_response), 1
+    )
+    loaded_interactions = persistence.load_all(limit=1)
+
+    # Another instance keeps nothing and drops the row
+    other = SqlitePersistence(path)
+    other.load_all(limit=0)
+    other.close()
+
+    with pytest.raises(LookupError, match="Interaction #1 is no longer in"):
+        loaded_interactions[0]
+    persistence.close()
+
+
+def test_replay_llm_with_each_persistence(make_persistence, sample_request):
+    llm = MockReplayLLM(make_persistence(), replay_count=0)
+    live_response = llm.dict_completion(**sample_request)
+
+    replay_llm = MockReplayLLM(make_persistence(), replay_count=1)
+
+    assert replay_llm.dict_completion(**sample_request) == live_response
+
+
+class FlakyReplayLLM(MockReplayLLM):
+    """MockReplayLLM that echoes the last message and fails for messages starting with "fail" """
+
+    def live_call(self, **kwargs) -> dict:
+        content = kwargs["messages"][-1]["content"]
+        if content.startswith("fail"):
+            raise ConnectionError("Rate limited")
+        return {"choices": [{"message": {"content": content}}]}
+
+
+def echo_request(content: str) -> dict:
+    return {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": content}]}
+
+
+def replied(response: dict) -> str:
+    return response["choices"][0]["message"]["content"]
+
+
+def test_failed_live_call_leaves_no_gap_in_replays(make_persistence):
+    llm = FlakyReplayLLM(make_persistence())
+    llm.dict_completion(**echo_request("first"))
+    with pytest.raises(ConnectionError):
+        llm.dict_completion(**echo_request("fail"))
+    # The retry is recorded after the index the failed call used
+    llm.dict_completion(**echo_request("retry"))
+
+    llm = FlakyReplayLLM(make_persistence(), replay_count=2)
+    assert replied(llm.dict_completion(**echo_request("first"))) == "first"
+    assert replied(llm.dict_completion(**echo_request("retry"))) == "retry"
+    llm.dict_completion(**echo_request("third"))
+
+    # The live call didn't overwrite a replayed interaction
+    llm = FlakyReplayLLM(make_persistence(), replay_count=3)
+    assert [
+        replied(llm.dict_completion(**echo_request("")))
+        for _ in range(3)
+    ] == ["first", "retry", "third"]
+
+
+def test_partially_failed_batch_leaves_no_gap_in_replays(tmp_path):
+    llm = FlakyReplayLLM(tmp_path)
+    with pytest.raises(ConnectionError):
+        llm.response_batch_completion(
+            [echo_request("a"), echo_request("fail"), echo_request("c")]
+        )
+
+    llm = FlakyReplayLLM(tmp_path, replay_count=2)
+    responses = [replied(llm.dict_completion(**echo_request(""))) for _ in range(2)]
+    llm.dict_completion(**echo_request("d"))
+
+    assert responses == ["a", "c"]
+    assert sorted(p.name for p in tmp_path.glob("*.response.json")) == [
+        "1.response.json",
+        "2.response.json",
+        "3.response.json",
+    ]
+
+
+class CountingReplayLLM(MockReplayLLM):
+    """MockReplayLLM that counts its live calls"""
+
+    live_calls = 0
+
+    def live_call(self, **kwargs) -> dict:
+        self.live_calls += 1
+        return super().live_call(**kwargs)
+
+
+def test_cache_by_request_reuses_identical_requests(tmp_path, sample_request):
+    llm = CountingReplayLLM(tmp_path, cache_by_request=True)
+
+    first = llm.dict_completion(**sample_request)
+    second = llm.dict_completion(**sample_request)
+    llm.dict_completion(model="gpt-3.5-turbo", messages=[])
+
+    assert first == second
+    assert llm.live_calls == 2
+    # Cached responses are still recorded so replay positions stay intact
+    assert (tmp_path / "2.response.json").exists()
+
+
+def test_cache_by_request_returns_independent_responses(tmp_path, sample_request):
+    llm = CountingReplayLLM(tmp_path, cache_by_request=True)
+
+    first = llm.dict_completion(**sample_request)
+    first["choices"].append({"message": {"content": "Changed by the caller"}})
+    second = llm.dict_completion(**sample_request)
+    second["choices"][0]["message"]["content"] = "Changed again"
+    third = llm.dict_completion(**sample_request)
+
+    assert first is not second
+    assert third == {"choices": [{"message": {"content": "This is a live response"}}]}
+    # The reused response was recorded before the caller changed it
+    assert json.loads((tmp_path / "2.response.json").read_text()) == third
+
+
+def test_cache_by_request_includes_replayed_interactions(
+    tmp_path, sample_request, sample_response
+):
+    create_interaction_files(tmp_path, sample_request, sample_response)
+    llm = CountingReplayLLM(tmp_path, replay_count=1, cache_by_request=True)
+
+    llm.dict_completion(**sample_request)
+    response = llm.dict_completion(**sample_request)
+
+    assert response == sample_response
+    assert llm.live_calls == 0
+
+
+def test_cache_by_request_evicts_least_recently_used(tmp_path):
+    llm = CountingReplayLLM(tmp_path, cache_by_request=True)
+    llm.response_cache_size = 2
+
+    for content in ("a", "b", "a", "c", "a", "b"):
+        llm.dict_completion(messages=[{"role": "user", "content": content}])
+
+    # "b" was evicted when "c" was added, "a" stayed in the cache
+    assert llm.live_calls == 4
+
+
+class EchoReplayLLM(MockReplayLLM):
+    """MockReplayLLM that answers with the content of the last message"""
+
+    def live_call(self, **kwargs) -> dict:
+        content = kwargs["messages"][-1]["content"]
+        # Let later requests finish first
+        time.sleep(0.01 * (3 - len(content)))
+        return {"choices": [{"message": {"content": content}}]}
+
+
+def test_response_batch_completion_keeps_request_order(tmp_path):
+    many_kwargs = [
+        {"messages": [{"role": "user", "content": "a" * n}]} for n in (1, 2, 3)
+    ]
+    llm = EchoReplayLLM(tmp_path)
+    responses = llm.response_batch_completion(many_kwargs)
+
+    replay_llm = EchoReplayLLM(tmp_path, replay_count=3)
+    replayed = [replay_llm.dict_completion(**kwargs) for kwargs in many_kwargs]
+
+    contents = [r["choices"][0]["message"]["content"] for r in responses]
+    assert contents == ["a", "aa", "aaa"]
+    assert replayed == responses
+    assert llm.replay_index == 3
+
+
+def test_cache_by_request_skips_uncacheable_responses(tmp_path, sample_request):
+    llm = CountingReplayLLM(tmp_path, cache_by_request=True)
+    llm.is_cacheable = lambda res_dict: False
+
+    llm.dict_completion(**sample_request)
+    llm.dict_completion(**sample_request)
+
+    assert llm.live_calls == 2
+
+
+class BarrierReplayLLM(MockReplayLLM):
+    """MockReplayLLM whose live calls wait for each other, so they are all in flight together"""
+
+    def __init__(self, *args, parties: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def live_call(self, **kwargs) -> dict:
+        self.barrier.wait()
+        return {"choices": [{"message": {"content": kwargs["messages"][-1]["content"]}}]}
+
+
+def test_dict_completion_from_several_threads(tmp_path):
+    contents = ["a", "b", "c", "d"]
+    llm = BarrierReplayLLM(tmp_path, parties=len(contents))
+    with ThreadPoolExecutor(max_workers=len(contents)) as executor:
+        futures = [
+            executor.submit(llm.dict_completion, messages=[{"role": "user", "content": content}])
+            for content in contents
+        ]
+        for future in futures:
+            future.result()
+
+    # Every call got its own index, and none was skipped
+    assert llm.replay_index == len(contents)
+    assert sorted(p.name for p in tmp_path.glob("*.request.json")) == [
+        f"{index}.request.json" for index in range(1, len(contents) + 1)
+    ]
+    recorded = [
+        json.loads((tmp_path / f"{index}.request.json").read_text())["messages"][-1]["content"]
+        for index in range(1, len(contents) + 1)
+    ]
+    assert sorted(recorded) == contents
+
+
+def test_load_all_removes_files_not_loaded(tmp_path, sample_request, sample_response):
+    persistence = FilePersistence(tmp_path)
+    for index in (1, 2):
+        persistence.save(
+            LLMInteraction(timestamp="", request=sample_request, response=sample_response),
+            index,
+        )
+    (tmp_path / "stray.json").write_text("{}")
+    (tmp_path / "notes.txt").write_text("kept")
+
+    persistence.load_all(limit=1)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "1.request.json",
+        "1.response.json",
+        "notes.txt",
+    ]
+
+
+def test_save_leaves_no_temporary_files(tmp_path, sample_request, sample_response):
+    persistence = FilePersistence(tmp_path, durable=True)
+    persistence.save(
+        LLMInteraction(timestamp="", request=sample_request, response=sample_response), 1
+    )
+    # Left over by an interrupted save
+    (tmp_path / ".2.request.json.tmp").write_text("{")
+
+    loaded_interactions = FilePersistence(tmp_path).load_all(limit=1)
+
+    assert loaded_interactions[0].response == sample_response
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "1.request.json",
+        "1.response.json",
+    ]